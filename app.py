@@ -3,24 +3,204 @@
 # ==========================================================
 
 
-import rasterio
 import numpy as np
-import tempfile
 import os
-import json
+import orjson
+import hashlib
+from collections import namedtuple
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
 import folium
 from folium.raster_layers import ImageOverlay
+from folium.plugins import VectorGridProtobuf
+from folium.template import Template
+from branca.element import MacroElement
+from branca.colormap import linear
 from streamlit_folium import st_folium
-import plotly.express as px
-from geopy.distance import geodesic
+import streamlit.components.v1 as components
+import plotly.graph_objects as go
+import pydeck as pdk
 from datetime import datetime
 from PIL import Image
 import base64
 from io import BytesIO
 
 
+# -----------------------------
+# Half-basin tooltip (module constants)
+# -----------------------------
+BASIN_TOOLTIP_FIELDS = ['mean_Q', 'med_Q', 'max_Q', 'min_Q', 'sum_Q', 'std_Q']
+BASIN_TOOLTIP_ALIASES = ['Mean Q', 'Median Q', 'Max Q', 'Min Q', 'Sum Q', 'Std Dev Q']
+
+# Tooltip with all statistics. Kept as kwargs: a folium element can only belong to one map,
+# so each cached map gets its own GeoJsonTooltip built from these.
+BASIN_TOOLTIP = dict(
+    fields=BASIN_TOOLTIP_FIELDS,
+    aliases=BASIN_TOOLTIP_ALIASES,
+    localize=False,  # values are pre-rounded by scripts/simplify_basins.py
+    sticky=False,
+    labels=True,
+    style="""
+        background-color: white;
+        border: 1px solid black;
+        border-radius: 3px;
+        padding: 5px;
+    """
+)
+
+
+# -----------------------------
+# Static HTML blocks (module constants, not rebuilt in the render flow)
+# -----------------------------
+NAV_ITEMS = [
+    ("flood_overview", "Flood Incident, Rainfall Chart and Climate Station Location", ""),
+    ("kalibabon-section", "Kali Babon Watershed Analysis", ""),
+    ("streamnetwork", "Stream Network Configuration", ""),
+    ("lulcstatus", "LULC Status and Slope", ""),
+    ("rpi_q", "RPI, Rainfall, and Runoff (Q)", ""),
+    ("q_analysis", "Half-Basin Runoff (Q) Statistics", ""),
+    ("methodology", "Methodology", " font-weight:bold;"),
+]
+NAV_LINK = (
+    """<li><a href="#{anchor}" style="color:white; text-decoration:none; display:block; padding:5px 0;{extra} transition:0.3s;" """
+    """onmouseover="this.style.color='#00ffff'" onmouseout="this.style.color='white'">{label}</a></li>"""
+)
+SIDEBAR_NAV_HTML = """
+        <div style="color:white; font-size:1rem; font-family:sans-serif;">
+            <h3 style="margin-bottom:15px; border-bottom:1px solid white; padding-bottom:5px;">Navigation</h3>
+            <ul style="list-style-type:none; padding-left:0; line-height:2;">
+""" + "\n".join(
+    " " * 16 + NAV_LINK.format(anchor=a, label=l, extra=x) for a, l, x in NAV_ITEMS
+) + """
+            </ul>
+        </div>
+        """
+
+RPI_HTML = """
+    <div id="rpi_q" style="margin:5vw auto; max-width:90%; line-height:1.6; text-align:justify; color:white;">
+        <h1 style="font-size:clamp(22px, 2.2vw, 32px); text-align:left; margin-bottom:20px;">
+            Runoff Potential Index (RPI), Rainfall, and Discharge (Q) Analysis
+        </h1>
+        <div style="font-size:clamp(14px, 1.5vw, 18px); line-height:1.8;">
+            <strong>Runoff Potential Index (RPI)</strong><br>
+            The RPI was developed to estimate spatial variations in runoff potential across the upper Kali Babon Watershed. 
+            The analysis integrates three key factors: land cover (LULC 2025), slope, and flow accumulation. 
+            The runoff coefficient (C) for each LULC class was derived based on <strong>Dhakal (2019)</strong>, slope values were normalized from the 8 × 8 m DEMNAS data, and flow accumulation was obtained from the r.watershed plugin. 
+            A weighted overlay was applied with <strong>w_LULC = 0.5</strong>, <strong>w_slope = 0.3</strong>, and <strong>w_accumulation = 0.2</strong> to generate the RPI map.
+            <br><br>
+            The resulting RPI distribution indicates that the <strong>West-1 Segment</strong> ranges from moderate to very high, the <strong>East-1 Segment</strong> is predominantly low to moderate, and the <strong>East Segment</strong> exhibits very low to low runoff potential.
+            <br><br>
+            <strong>Rainfall and Discharge (Q)</strong><br>
+            Rainfall data from all climate stations were collected for the extreme flood event on <strong>6 January 2023</strong>, when daily precipitation ranged from 21.52 mm to 64.20 mm. 
+            These data were spatially interpolated to create a continuous rainfall surface, revealing that the highest rainfall occurred in the <strong>East Segment</strong>, while lower intensities were observed toward the southwest.
+            <br><br>
+            By combining the interpolated rainfall map with the RPI, a <strong>discharge (Q) map</strong> was generated to estimate spatial runoff magnitudes and identify flood-prone zones. 
+            Zonal statistics for half-basin segments quantified flow accumulation and peak discharge, demonstrating how the interaction of land cover, slope, and upstream contributing areas governs downstream hydrological response.
+            <br><br>
+            The analysis identifies the <strong>West-1 Segment</strong> and the <strong>East Segment</strong> as the dominant contributors to downstream flooding. 
+            The West-1 Segment is mostly urbanized on a flat, high-elevation plateau, with only small areas of steep slopes covered by forest and grassland that locally enhance runoff. 
+            The East Segment, in contrast, contributes significant flow due to the extreme rainfall (>60 mm/day) it received during the event. 
+            This combination of high-intensity rainfall in the East segment and localized runoff from steeper portions of West-1 explains the major flooding observed at Perumahan Dinar Indah. 
+            The East-1 Segment shows lower discharge due to moderate slopes and land cover that promotes infiltration.
+            <br><br>
+            <em style="color:#c2e5ff;">
+            Users can interact with the map above by selecting or deselecting the <strong>RPI</strong>, <strong>Rainfall</strong>, and <strong>Discharge (Q)</strong> layers using the checklist. 
+            Dropdown menus allow switching between descriptive classifications and hydrological interpretations for each layer, providing a dynamic and interactive way to explore watershed behavior and flood vulnerability.
+            </em>
+        </div>
+    </div>
+    """
+
+Q_ANALYSIS_HTML = """
+    <div id="q_analysis" style="margin:5vw auto; max-width:90%; line-height:1.8; color:white;">
+        <h1 style="
+            font-size:clamp(22px, 2.2vw, 32px); 
+            text-align:center; 
+            margin-bottom:15px;
+        ">
+            Runoff (Q) Analysis by Half-Basin
+        </h1>
+        <div style="
+            font-size:clamp(14px, 1.5vw, 18px); 
+            line-height:1.8; 
+            text-align:justify;
+        ">
+            The runoff (Q) analysis was performed by aggregating flow estimates for each <strong>half-basin segment</strong>, providing a detailed view of sub-catchment contributions to downstream flooding. The <strong>mean Q values</strong> per half-basin highlight spatial differences in runoff response:
+            <br><br>
+            <strong>West-1 Segment:</strong> Mean Q ranges from 12 to 17. Mostly urbanized on a flat plateau, with small areas of steeper slopes covered by forest and grassland that locally enhance runoff.
+            <br>
+            <strong>East Segment:</strong> Mean Q ranges from 11 to 15. Receives the highest rainfall (>60 mm/day) but runoff is moderated by gentle slopes and mixed agricultural/grassland cover.
+            <br>
+            <strong>East-1 Segment:</strong> Mean Q is approximately 10–11, reflecting lower runoff due to moderate slopes and forested patches promoting infiltration.
+            <br><br>
+            These results illustrate that <strong>flood risk is influenced by rainfall intensity, physiography, and land cover</strong>. 
+            <br><br>
+            On the interactive map:
+            <ul>
+                <li>Hover over each half-basin to view detailed statistics and notes for that segment.</li>
+                <li>Use the opacity slider to adjust the half-basin transparency, making it easier to observe underlying geographic features and segment names.</li>
+            </ul>
+            This approach allows users to dynamically explore which areas dominate runoff production and how different segments interact to influence downstream flooding, supporting data-informed management decisions.
+        </div>
+    </div>
+    """
+
+METHODOLOGY_HTML = """
+    <div id="methodology" style="margin-top:50px; font-size:40px; font-weight:bold; text-align:left; color:white;">
+        Methodology
+    </div>
+
+    <div style="font-size:16px; color:white; text-align:justify; margin-top:15px;">
+        This study integrates <strong>data collection, processing, hydrological analysis, and mapping</strong>
+        to assess flood hazards and runoff dynamics within the Kali Babon Watershed. Flood incident data 
+        (2020–2023) were obtained from <em>BPBD Jawa Tengah</em>, while rainfall data (2021–2023) were 
+        sourced from PUSDATARU Jawa Tengah and BBWS Pemali Juana, then extracted from PDF format using 
+        a dedicated Python script.
+    </div>
+
+    <div style="font-size:16px; color:white; text-align:justify; margin-top:15px;">
+        <strong>DEM data</strong> from <em>DEMNAS</em> with 8×8 m resolution were used to derive 
+        <strong>elevation, slope, and watershed boundaries</strong>. The DEM was first hydrologically 
+        corrected using <strong>r.fill</strong> to remove sinks, then <strong>r.watershed</strong> 
+        was applied to calculate flow accumulation.
+    </div>
+
+    <div style="font-size:16px; color:white; text-align:justify; margin-top:15px;">
+        <strong>LULC data</strong> were obtained from <em>Sentinel-2 Copernicus imagery</em> and 
+        classified using the <strong>Semi-Automatic Classification Plugin (SCP) in QGIS</strong> 
+        with a Random Forest classifier of 400 trees and balanced class weights to ensure accurate 
+        land cover mapping.
+    </div>
+
+    <div style="font-size:16px; color:white; text-align:justify; margin-top:15px;">
+        The <strong>Runoff Potential Index (RPI)</strong> was computed by integrating LULC-derived 
+        runoff coefficients (C, according to Dhakal, 2019), normalized slope, and flow accumulation, 
+        using weights of 0.5 (LULC), 0.3 (slope), and 0.2 (accumulation). RPI values were standardized 
+        and classified into minimum–maximum ranges to evaluate runoff potential for each segment.
+    </div>
+
+    <div style="font-size:16px; color:white; text-align:justify; margin-top:15px;">
+        <strong>Runoff (Q)</strong> was estimated using the RPI and interpolated rainfall data, 
+        followed by a half-basin analysis to summarize mean Q per sub-catchment, providing insight 
+        into the contribution of upstream segments to downstream flood risk.
+    </div>
+
+    <div style="font-size:16px; color:white; text-align:justify; margin-top:15px;">
+        All maps—including RPI, rainfall intensity, slope, and runoff—were standardized according 
+        to hydrological theory and conventional classification ranges (e.g., very low to very high), 
+        enabling consistent interpretation of flood hazards and runoff dynamics.
+    </div>
+
+    <div style="font-size:16px; color:white; text-align:justify; margin-top:15px;">
+        This integrated workflow provides a comprehensive framework combining <strong>observational 
+        data, satellite imagery classification, hydrologically corrected DEM analysis, spatial processing, 
+        hydrological modeling, and standardized mapping</strong> to support robust understanding of 
+        flood behavior and runoff characteristics across the Kali Babon Watershed.
+    </div>
+    """
+
+
 # Set wide layout
 st.set_page_config(page_title="Semarang Flood Monitor", layout="wide")
 
@@ -50,13 +230,13 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# Load logo
-logo = Image.open("logo.png")
+# Load logo as base64 (raw PNG bytes, no decode/re-encode)
+@st.cache_data
+def _logo_b64(path="logo.png"):
+    with open(path, "rb") as f:
+        return base64.b64encode(f.read()).decode()
 
-# Convert logo to base64
-buffered = BytesIO()
-logo.save(buffered, format="PNG")
-img_str = base64.b64encode(buffered.getvalue()).decode()
+img_str = _logo_b64()
 
 with st.sidebar:
     # -----------------------------
@@ -94,23 +274,7 @@ with st.sidebar:
     # -----------------------------
     # Navigation Links
     # -----------------------------
-    st.markdown(
-        """
-        <div style="color:white; font-size:1rem; font-family:sans-serif;">
-            <h3 style="margin-bottom:15px; border-bottom:1px solid white; padding-bottom:5px;">Navigation</h3>
-            <ul style="list-style-type:none; padding-left:0; line-height:2;">
-                <li><a href="#flood_overview" style="color:white; text-decoration:none; display:block; padding:5px 0; transition:0.3s;" onmouseover="this.style.color='#00ffff'" onmouseout="this.style.color='white'">Flood Incident, Rainfall Chart and Climate Station Location</a></li>
-                <li><a href="#kalibabon-section" style="color:white; text-decoration:none; display:block; padding:5px 0; transition:0.3s;" onmouseover="this.style.color='#00ffff'" onmouseout="this.style.color='white'">Kali Babon Watershed Analysis</a></li>
-                <li><a href="#streamnetwork" style="color:white; text-decoration:none; display:block; padding:5px 0; transition:0.3s;" onmouseover="this.style.color='#00ffff'" onmouseout="this.style.color='white'">Stream Network Configuration</a></li>
-                <li><a href="#lulcstatus" style="color:white; text-decoration:none; display:block; padding:5px 0; transition:0.3s;" onmouseover="this.style.color='#00ffff'" onmouseout="this.style.color='white'">LULC Status and Slope</a></li>
-                <li><a href="#rpi_q" style="color:white; text-decoration:none; display:block; padding:5px 0; transition:0.3s;" onmouseover="this.style.color='#00ffff'" onmouseout="this.style.color='white'">RPI, Rainfall, and Runoff (Q)</a></li>
-                <li><a href="#q_analysis" style="color:white; text-decoration:none; display:block; padding:5px 0; transition:0.3s;" onmouseover="this.style.color='#00ffff'" onmouseout="this.style.color='white'">Half-Basin Runoff (Q) Statistics</a></li>
-                <li><a href="#methodology" style="color:white; text-decoration:none; display:block; padding:5px 0; font-weight:bold; transition:0.3s;" onmouseover="this.style.color='#00ffff'" onmouseout="this.style.color='white'">Methodology</a></li>
-            </ul>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+    st.markdown(SIDEBAR_NAV_HTML, unsafe_allow_html=True)
 
     # -----------------------------
     # Separator
@@ -127,69 +291,165 @@ with st.sidebar:
 # ==========================================================
 # Load Data
 # ==========================================================
-@st.cache_data
-def load_data():
-    flood_path = "data/flood_data_with_latlon.csv"
-    rain_path = "data/rainfall_data_filtered.csv"
-
-
-    for path in [flood_path, rain_path]:
-        if not os.path.exists(path):
-            st.error(f"❌ File not found: {path}")
-            st.stop()
-
-    flood_df = pd.read_csv(flood_path)
-    rain_df = pd.read_csv(rain_path)
+FLOOD_PATH = "data/flood_data_with_latlon.csv"
+RAIN_PATH = "data/rainfall_data_filtered.csv"
+
+# Only the columns used by the dashboard are read from the CSVs
+FLOOD_COLS = ["date", "lat", "lon", "Name_of_area"]
+RAIN_COLS = ["date", "Lat_DD", "Lon_DD", "location_name", "rainfall(mm)"]
+# Repeated labels are stored as categoricals
+FLOOD_DTYPES = {"date": "object", "lat": "float64", "lon": "float64", "Name_of_area": "category"}
+RAIN_DTYPES = {
+    "date": "object",
+    "Lat_DD": "float64",
+    "Lon_DD": "float64",
+    "location_name": "category",
+    "rainfall(mm)": "float64",
+}
 
-    flood_df['date'] = pd.to_datetime(flood_df['date'], format="%m/%d/%y", errors='coerce')
-    rain_df['date'] = pd.to_datetime(rain_df['date'], format="%m/%d/%y", errors='coerce')
+PARQUET_CACHE_VERSION = 4
+
+def _parse_dates(s):
+    # Parse each distinct date string once, then map back onto the rows
+    u = s.unique()
+    m = dict(zip(u, pd.to_datetime(u, format="%m/%d/%y", errors='coerce')))
+    return s.map(m)
+
+def _parse_flood_csv(path):
+    flood_df = pd.read_csv(path, engine="pyarrow", usecols=FLOOD_COLS, dtype=FLOOD_DTYPES)
+    flood_df['date'] = _parse_dates(flood_df['date'])
+    flood_df = flood_df.dropna(subset=['lat', 'lon', 'date'])
+    # float32 keeps ~1 m precision for coordinates at half the memory
+    flood_df = flood_df.astype({'lat': np.float32, 'lon': np.float32})
+    flood_df['lat_rad'] = np.deg2rad(flood_df['lat'].to_numpy(np.float32))
+    flood_df['lon_rad'] = np.deg2rad(flood_df['lon'].to_numpy(np.float32))
+    return flood_df
+
+def _parse_rain_csv(path):
+    rain_df = pd.read_csv(path, engine="pyarrow", usecols=RAIN_COLS, dtype=RAIN_DTYPES)
+    rain_df['date'] = _parse_dates(rain_df['date'])
+    rain_df = rain_df.dropna(subset=['Lat_DD', 'Lon_DD', 'date', 'rainfall(mm)'])
+    rain_df = rain_df.astype({'Lat_DD': np.float32, 'Lon_DD': np.float32})
+    rain_df['Lat_rad'] = np.deg2rad(rain_df['Lat_DD'].to_numpy(np.float32))
+    rain_df['Lon_rad'] = np.deg2rad(rain_df['Lon_DD'].to_numpy(np.float32))
+    return rain_df
+
+def _read_with_parquet_cache(csv_path, parse_csv):
+    # Typed Parquet copy next to the CSV; reused while it is newer than the CSV.
+    # Bump PARQUET_CACHE_VERSION whenever the parsed columns change.
+    parquet_path = f"{csv_path}.v{PARQUET_CACHE_VERSION}.parquet"
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path):
+        try:
+            return pd.read_parquet(parquet_path, engine="pyarrow")
+        except (OSError, pa.ArrowInvalid):
+            pass  # unreadable copy: reparse the CSV and replace it below
+
+    df = parse_csv(csv_path)
+    # Write under a per-process temp name and rename into place, so a killed or
+    # concurrent writer never leaves a truncated file at parquet_path
+    tmp_path = f"{parquet_path}.{os.getpid()}.tmp"
+    try:
+        df.to_parquet(tmp_path, engine="pyarrow", compression="zstd")
+        os.replace(tmp_path, parquet_path)
+    except OSError:
+        # read-only deployment: keep serving from the CSV
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return df
+
+def _source_mtimes(paths):
+    # One stat per file; doubles as the existence check and the cache key
+    try:
+        return tuple(os.path.getmtime(path) for path in paths)
+    except FileNotFoundError as e:
+        st.error(f"❌ File not found: {e.filename}")
+        st.stop()
+
+@st.cache_data(persist="disk", show_spinner="Loading flood & rainfall data...")
+def load_data(flood_mtime, rain_mtime):
+    # The mtimes are only the cache key, so edited CSVs are picked up on the next rerun
+    flood_df = _read_with_parquet_cache(FLOOD_PATH, _parse_flood_csv)
+    rain_df = _read_with_parquet_cache(RAIN_PATH, _parse_rain_csv)
+    return flood_df, rain_df
 
-    flood_df['lat'] = pd.to_numeric(flood_df['lat'], errors='coerce')
-    flood_df['lon'] = pd.to_numeric(flood_df['lon'], errors='coerce')
-    flood_df = flood_df.dropna(subset=['lat', 'lon'])
+source_mtimes = _source_mtimes([FLOOD_PATH, RAIN_PATH])
+flood_df, rain_df = load_data(*source_mtimes)
 
-    rain_df['Lat_DD'] = pd.to_numeric(rain_df['Lat_DD'], errors='coerce')
-    rain_df['Lon_DD'] = pd.to_numeric(rain_df['Lon_DD'], errors='coerce')
-    rain_df = rain_df.dropna(subset=['Lat_DD', 'Lon_DD'])
+# ==========================================================
+# Prepare Map Data
+# ==========================================================
+def haversine_km(lat1r, lon1r, lat2r, lon2r):
+    # Great-circle distance (km), element-wise with NumPy broadcasting (inputs in radians)
+    dlat = lat1r - lat2r
+    dlon = lon1r - lon2r
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1r) * np.cos(lat2r) * np.sin(dlon / 2) ** 2
+    return 2 * 6371.0 * np.arcsin(np.sqrt(a))
+
+@st.cache_resource
+def _station_lookup(station_df):
+    # Station lookup arrays, built once per station set
+    return {
+        'lat_rad': station_df['lat_rad'].to_numpy(),
+        'lon_rad': station_df['lon_rad'].to_numpy(),
+        'lat': station_df['lat'].to_numpy(),
+        'lon': station_df['lon'].to_numpy(),
+        'name': station_df['hover_text'].to_numpy(),
+    }
 
-    rain_df = rain_df.dropna(subset=['date'])
-    flood_df = flood_df.dropna(subset=['date'])
+def query_nearest_station(stations, lat_rad, lon_rad):
+    # Returns (distance_km, station_index) of the closest station for each point.
+    # Loops over the handful of stations keeping a running minimum, so memory stays
+    # O(points) and ranking uses the exact great-circle distance.
+    best = np.full(lat_rad.shape, np.inf)
+    idx = np.zeros(lat_rad.shape, dtype=np.intp)
+    for j, (slat, slon) in enumerate(zip(stations['lat_rad'], stations['lon_rad'])):
+        d = haversine_km(lat_rad, lon_rad, slat, slon)
+        closer = d < best
+        best[closer] = d[closer]
+        idx[closer] = j
+    return best, idx
 
+@st.cache_data
+def build_station_df(rain_df):
+    # One pipeline: each step returns a new frame, so no defensive copy is needed
+    return (
+        rain_df[['Lat_DD','Lon_DD','Lat_rad','Lon_rad','location_name']]
+        .drop_duplicates()
+        .rename(columns={'Lat_DD':'lat','Lon_DD':'lon','Lat_rad':'lat_rad','Lon_rad':'lon_rad'})
+        .assign(hover_text=lambda d: d['location_name'], type='Station')
+    )
 
-    return flood_df, rain_df
+@st.cache_data
+def build_flood_df(flood_df, station_df):
+    # Flood points joined to their nearest station, with hover text
+    flood_map_df = flood_df[['lat','lon','lat_rad','lon_rad','date','Name_of_area']].copy()
+    stations = _station_lookup(station_df)
+    _, nearest_idx = query_nearest_station(stations, flood_map_df['lat_rad'].to_numpy(), flood_map_df['lon_rad'].to_numpy())
+    flood_map_df['nearest_station'] = stations['name'][nearest_idx]
+    flood_map_df['nearest_lat'] = stations['lat'][nearest_idx]
+    flood_map_df['nearest_lon'] = stations['lon'][nearest_idx]
+    # Hover text is formatted once per data version; downstream code only reads it
+    flood_map_df['hover_text'] = (
+        flood_map_df['date'].dt.strftime('%Y-%m-%d') + 
+        " | " + flood_map_df['Name_of_area'].astype(str) + 
+        " | Nearest Station: " + flood_map_df['nearest_station']
+    )
+    # Sorted midnight-day index so a date filter is a binary search, not a full scan
+    flood_map_df['day'] = flood_map_df['date'].dt.normalize()
+    return flood_map_df.set_index('day').sort_index(kind='stable')
 
-flood_df, rain_df = load_data()
+@st.cache_data
+def flood_date_summary(flood_map_df):
+    # Unique flood dates for the reference table, plus the slider range
+    # The day index is already normalized and sorted; format only for display
+    days = flood_map_df.index.unique()
+    unique_dates = pd.Series(days.strftime('%Y-%m-%d'))
+    return unique_dates, days[0].date(), days[-1].date()
 
-# ==========================================================
-# Prepare Map Data
-# ==========================================================
-station_map_df = rain_df[['Lat_DD','Lon_DD','location_name']].drop_duplicates().copy()
-station_map_df['hover_text'] = station_map_df['location_name']
-station_map_df['type'] = 'Station'
-station_map_df = station_map_df.rename(columns={'Lat_DD':'lat','Lon_DD':'lon'})
-
-flood_map_df = flood_df[['lat','lon','date','Name_of_area']].copy()
-
-def find_nearest_station(lat, lon, station_df):
-    min_dist = float('inf')
-    nearest_name = None
-    nearest_coords = None
-    for _, s in station_df.iterrows():
-        dist = geodesic((lat, lon), (s['lat'], s['lon'])).meters
-        if dist < min_dist:
-            min_dist = dist
-            nearest_name = s['hover_text']
-            nearest_coords = (s['lat'], s['lon'])
-    return nearest_name, nearest_coords
-
-flood_map_df[['nearest_station', 'nearest_coords']] = flood_map_df.apply(
-    lambda x: find_nearest_station(x['lat'], x['lon'], station_map_df), axis=1, result_type="expand"
-)
-flood_map_df['hover_text'] = (
-    flood_map_df['date'].dt.strftime('%Y-%m-%d') + 
-    " | " + flood_map_df['Name_of_area'] + 
-    " | Nearest Station: " + flood_map_df['nearest_station']
-)
+station_map_df = build_station_df(rain_df)
+flood_map_df = build_flood_df(flood_df, station_map_df)
 
 
 st.markdown(
@@ -235,14 +495,12 @@ st.markdown(
 
 
 # Show only the unique flood dates without index
-unique_flood_dates = flood_map_df['date'].dt.date.drop_duplicates().sort_values().reset_index(drop=True)
+unique_flood_dates, min_date, max_date = flood_date_summary(flood_map_df)
 st.table(unique_flood_dates.to_frame(name="Flood Date"))
 
 # -----------------------------
 # Slider
 # -----------------------------
-min_date = flood_map_df['date'].min().date()
-max_date = flood_map_df['date'].max().date()
 
 st.markdown(
     '<div style="max-width:600px; margin:10px auto 30px auto;">', 
@@ -260,7 +518,8 @@ st.markdown("</div>", unsafe_allow_html=True)
 # -----------------------------
 # Filter flood data
 # -----------------------------
-flood_selected_df = flood_map_df[flood_map_df['date'].dt.date == selected_date]
+selected_day = pd.Timestamp(selected_date)
+flood_selected_df = flood_map_df.loc[selected_day:selected_day]
 
 # Checkbox: show all flood data
 if selected_station == "All Stations":
@@ -278,10 +537,10 @@ st.subheader("🗺️ Flood and Climate Station Point Map")
 # -----------------------------
 if not flood_to_plot.empty:
     flood_coords = flood_to_plot[['lat','lon']].mean().to_list()
-    nearest_coords = flood_to_plot.iloc[0]['nearest_coords']
-    if nearest_coords:
-        center_lat = (flood_coords[0] + nearest_coords[0]) / 2
-        center_lon = (flood_coords[1] + nearest_coords[1]) / 2
+    first = flood_to_plot.iloc[0]
+    if pd.notna(first['nearest_lat']):
+        center_lat = (flood_coords[0] + first['nearest_lat']) / 2
+        center_lon = (flood_coords[1] + first['nearest_lon']) / 2
     else:
         center_lat, center_lon = flood_coords
 else:
@@ -289,52 +548,88 @@ else:
     center_lon = station_map_df['lon'].mean()
 
 
-m = folium.Map(location=[center_lat, center_lon], zoom_start=11, scrollWheelZoom=enable_map_interaction,
-    dragging=enable_map_interaction, tiles="OpenStreetMap")
+STATION_COLOR = [0, 0, 255, 230]
+SELECTED_STATION_COLOR = [0, 128, 0, 230]
+FLOOD_COLOR = [255, 0, 0, 230]
 
-# Add stations
-for _, row in station_map_df.iterrows():
-    icon_color = 'green' if row['hover_text'] == selected_station else 'blue'
-    folium.Marker(
-        location=[row['lat'], row['lon']],
-        popup=row['hover_text'],
-        tooltip=row['hover_text'],
-        icon=folium.Icon(color=icon_color, icon='info-sign')
-    ).add_to(m)
-
-# Add flood points
-for _, row in flood_to_plot.iterrows():
-    folium.Marker(
-        location=[row['lat'], row['lon']],
-        popup=row['hover_text'],
-        tooltip=row['hover_text'],
-        icon=folium.Icon(color='red', icon='tint')
-    ).add_to(m)
+# WebGL scatter layers: points go to the browser as one JSON array, not per-marker HTML
+station_points = station_map_df[['lon','lat','hover_text']].assign(
+    color=[SELECTED_STATION_COLOR if t == selected_station else STATION_COLOR
+           for t in station_map_df['hover_text']]
+)
+station_layer = pdk.Layer(
+    "ScatterplotLayer",
+    data=station_points,
+    get_position=['lon', 'lat'],
+    get_fill_color='color',
+    radius_min_pixels=6,
+    pickable=True
+)
+flood_layer = pdk.Layer(
+    "ScatterplotLayer",
+    data=flood_to_plot[['lon','lat','hover_text']],
+    get_position=['lon', 'lat'],
+    get_fill_color=FLOOD_COLOR,
+    get_line_color=[139, 0, 0],
+    stroked=True,
+    line_width_min_pixels=1,
+    radius_min_pixels=7,
+    pickable=True
+)
 
-# Adjust map container width for responsiveness
-st_folium(m, width=None, height=500)
+deck = pdk.Deck(
+    layers=[station_layer, flood_layer],
+    initial_view_state=pdk.ViewState(latitude=float(center_lat), longitude=float(center_lon), zoom=11),
+    views=[pdk.View(type="MapView", controller=enable_map_interaction)],
+    map_style="light",
+    tooltip={"text": "{hover_text}"}
+)
+st.pydeck_chart(deck, height=500)
 
 
 st.subheader("📈 Rainfall Trends")
 
-# Filter data by selected station and make a copy
-rain_plot_df = (
-    rain_df.copy() if selected_station == "All Stations" 
-    else rain_df[rain_df['location_name'] == selected_station].copy()
-)
+@st.cache_data(show_spinner=False)
+def build_rain_fig(selected_station, data_key, _rain_df):
+    # Keyed on the station name and source mtimes (data_key); the frame is not hashed
+    # Filter data by selected station
+    rain_plot_df = (
+        _rain_df if selected_station == "All Stations" 
+        else _rain_df[_rain_df['location_name'] == selected_station]
+    )
 
-# Drop invalid rows
-rain_plot_df = rain_plot_df.dropna(subset=['date', 'rainfall(mm)'])
-
-# Plot raw daily rainfall as line chart
-fig = px.line(
-    rain_plot_df,
-    x='date',
-    y='rainfall(mm)',
-    color='location_name',
-    title="Daily Rainfall (mm)",
-    markers=True
-)
+    # One point per station per day (daily mean of any repeated readings)
+    rain_plot_df = (
+        rain_plot_df.set_index('date')
+        .groupby('location_name', observed=True)['rainfall(mm)']
+        .resample('D').mean()
+        .dropna()
+        .reset_index()
+    )
+
+    # Plot the daily means as one WebGL (Scattergl) line+marker trace per station
+    fig = go.Figure()
+    for name, grp in rain_plot_df.groupby('location_name', observed=True, sort=False):
+        fig.add_trace(go.Scattergl(
+            x=grp['date'].to_numpy(),
+            y=grp['rainfall(mm)'].to_numpy(),
+            mode='lines+markers',
+            name=name
+        ))
+
+    fig.update_layout(
+        title="Daily Rainfall (mm)",
+        xaxis_title="Date",
+        yaxis_title="Rainfall (mm)",
+        height=1000,
+        width=1200,
+        showlegend=False
+    )
+    fig.update_xaxes(tickangle=45)
+    fig.update_layout(xaxis_rangeslider_visible=True)
+    return fig
+
+fig = build_rain_fig(selected_station, source_mtimes, rain_df)
 
 # Disable interactions if zoom not enabled
 if not enable_map_interaction:
@@ -353,16 +648,6 @@ else:
         "modeBarButtonsToRemove": ["select2d", "lasso2d"]
     }
 
-fig.update_layout(
-    xaxis_title="Date",
-    yaxis_title="Rainfall (mm)",
-    height=1000,
-    width=1200,
-    showlegend=False
-)
-fig.update_xaxes(tickangle=45)
-fig.update_layout(xaxis_rangeslider_visible=True)
-
 st.plotly_chart(fig, use_container_width=True,config=config)
 
 
@@ -491,10 +776,11 @@ st.subheader("LULC–Slope–River Overlay Map")
 # -----------------------------
 # Raster File Paths
 # -----------------------------
-@st.cache_data
-def load_geojson(path):
+@st.cache_resource
+def load_geojson_str(path):
+    # Raw text, cached without Streamlit's copy-on-return; folium.GeoJson parses JSON strings itself
     with open(path) as f:
-        return json.load(f)
+        return f.read()
 slope_tif = "data/slope_map.tif"
 lulc_files = {
     "2020-09-15": "data/lulc_2020_styled.tif",
@@ -503,7 +789,50 @@ lulc_files = {
     "2023-09-20": "data/lulc_2023_styled.tif",
     "2025-08-15": "data/lulc_2025_styled.tif",
 }
-river_geojson = load_geojson("data/babon_channel.geojson")
+# Display copy from scripts/simplify_geojson.py (rounded to 5 decimals, compact JSON)
+river_geojson = load_geojson_str("data/babon_channel.min.geojson")
+
+TILE_DIR = "static/tiles"
+
+def lulc_tile_url(tif_path):
+    # XYZ URL for a raster tiled by scripts/build_tiles.py, or None if not built
+    name = os.path.splitext(os.path.basename(tif_path))[0]
+    if os.path.isdir(os.path.join(TILE_DIR, name)):
+        return f"/app/static/tiles/{name}/{{z}}/{{x}}/{{y}}.png"
+    return None
+
+def vector_tile_url(layer):
+    # XYZ URL for a layer tiled by scripts/build_vector_tiles.py, or None if not built
+    if os.path.isdir(os.path.join(TILE_DIR, layer)):
+        return f"/app/static/tiles/{layer}/{{z}}/{{x}}/{{y}}.pbf"
+    return None
+
+class VectorGridTooltip(MacroElement):
+    # Hover tooltip for an interactive VectorGridProtobuf layer, laid out like GeoJsonTooltip
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        (function (grid) {
+            var tip = L.tooltip({sticky: true, className: "foliumtooltip"});
+            grid.on("mouseover", function (e) {
+                var p = e.layer.properties, aliases = {{ this.aliases|tojson }};
+                var rows = {{ this.fields|tojson }}.map(function (f, i) {
+                    var v = p[f];
+                    v = v == null ? "" : v;  // pre-rounded, like GeoJsonTooltip(localize=False)
+                    return "<tr><th>" + aliases[i] + "</th><td>" + v + "</td></tr>";
+                });
+                tip.setLatLng(e.latlng).setContent("<table>" + rows.join("") + "</table>");
+                grid._map.openTooltip(tip);
+            });
+            grid.on("mouseout", function () { grid._map.closeTooltip(tip); });
+        })({{ this._parent.get_name() }});
+        {% endmacro %}
+    """)
+
+    def __init__(self, fields, aliases):
+        super().__init__()
+        self._name = "VectorGridTooltip"
+        self.fields = fields
+        self.aliases = aliases
 
 # -----------------------------
 # LULC Year Selection
@@ -525,20 +854,67 @@ show_slope = st.checkbox("Show Slope Map", value=True)
 show_lulc = st.checkbox("Show LULC Map", value=True)
 show_river = st.checkbox("Show River Network", value=True)
 
-# -----------------------------
-# Initialize Folium Map
-# -----------------------------
-
-m = folium.Map(location=[-7.1, 110.45], zoom_start=12, tiles='Cartodb Positron', scrollWheelZoom=enable_map_interaction,
-    dragging=enable_map_interaction)
-
 # -----------------------------
 # Raster-to-PNG conversion with caching
 # -----------------------------
+OVERLAY_DIR = "static/overlays"
+
+OverlayBounds = namedtuple("OverlayBounds", ["left", "bottom", "right", "top"])
+
+def overlay_cache_paths(tif_path):
+    # Content-addressed PNG + bounds JSON: a changed raster gets a new key
+    stat = os.stat(tif_path)
+    key = hashlib.sha1(f"{tif_path}:{stat.st_mtime}:{stat.st_size}".encode()).hexdigest()
+    return os.path.join(OVERLAY_DIR, f"{key}.png"), os.path.join(OVERLAY_DIR, f"{key}.json")
+
+def overlay_url(png_path):
+    # Streamlit static serving maps ./static to /app/static
+    return "/app/" + png_path.replace(os.sep, "/")
+
+class StaticImageOverlay(ImageOverlay):
+    # ImageOverlay passes `image` through image_to_url, which reads any scheme-less
+    # string (our relative /app/static/... links) as a local file to embed. The
+    # placeholder "data:," is a valid URL it returns untouched; we then set `url`,
+    # the only attribute ImageOverlay's template renders for the image
+    # (L.imageOverlay(this.url, ...)). Checked against the pinned folium 0.20.0.
+    def __init__(self, image, bounds, **kwargs):
+        super().__init__(image="data:,", bounds=bounds, **kwargs)
+        self.url = image
+
+def write_atomic(path, payload):
+    # Temp file + rename: readers see the old file or the complete new one, never a partial write
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def png_data_uri(png_bytes):
+    # Inline fallback when the overlay cache directory is not writable
+    return "data:image/png;base64," + base64.b64encode(png_bytes).decode()
+
 @st.cache_data(show_spinner=False)
 def geotiff_to_temp_png(tif_path):
+    # Survives cache eviction and restarts: a rendered overlay is reused straight from disk
+    png_path, meta_path = overlay_cache_paths(tif_path)
+    if os.path.exists(png_path) and os.path.exists(meta_path):
+        try:
+            with open(meta_path, "rb") as f:
+                return overlay_url(png_path), OverlayBounds(**orjson.loads(f.read()))
+        except (OSError, orjson.JSONDecodeError, TypeError):
+            pass  # unreadable bounds sidecar: treat as a miss and re-render
+
+    import rasterio  # deferred: GDAL is only needed on a cache miss
+
     with rasterio.open(tif_path) as src:
-        bounds = src.bounds
+        bounds = OverlayBounds(*src.bounds)
+
         # Multi-band RGBA
         if src.count >= 4:
             arr = src.read([1,2,3,4])
@@ -549,71 +925,128 @@ def geotiff_to_temp_png(tif_path):
             arr = np.transpose(arr, (1,2,0))
             img = Image.fromarray(arr.astype(np.uint8)).convert("RGBA")
         else:
-            arr = src.read(1)
-            arr = np.where(arr == src.nodata, 0, arr)
-            arr = ((arr - arr.min()) / (arr.max()-arr.min()) * 255).astype(np.uint8)
-            img = Image.fromarray(arr).convert("RGBA")
-            # make zero values transparent
-            datas = img.getdata()
-            new_data = [(0,0,0,0) if item[0]==0 else item for item in datas]
-            img.putdata(new_data)
-
-        # Save to temporary PNG
-        tmp_file = tempfile.NamedTemporaryFile(suffix=".png", delete=False)
-        img.save(tmp_file.name)
-        return tmp_file.name, bounds
+            # float32 and in-place: one working buffer instead of several float64 temporaries
+            arr = src.read(1, out_dtype="float32")
+            if src.nodata is not None:
+                arr[arr == src.nodata] = 0
+            mn, mx = np.nanmin(arr), np.nanmax(arr)
+            arr -= mn
+            arr *= 255.0 / (mx - mn)
+            arr = arr.astype(np.uint8)
+            # Grey RGBA in one pass; zero values transparent
+            rgba = np.empty(arr.shape + (4,), dtype=np.uint8)
+            rgba[..., :3] = arr[..., None]
+            rgba[..., 3] = np.where(arr == 0, 0, 255)
+            img = Image.fromarray(rgba, mode="RGBA")
+
+    # Encode once in memory; write it for static serving, or inline it if we can't
+    buf = BytesIO()
+    img.save(buf, format="PNG", optimize=True)
+    try:
+        os.makedirs(OVERLAY_DIR, exist_ok=True)
+        # PNG first: the JSON sidecar marks a complete entry
+        write_atomic(png_path, buf.getvalue())
+        write_atomic(meta_path, orjson.dumps(bounds._asdict()))
+    except OSError:
+        return png_data_uri(buf.getvalue()), bounds
+    return overlay_url(png_path), bounds
 
 # -----------------------------
-# Add Selected Layers
+# Build Map with Selected Layers
 # -----------------------------
-temp_files = []  # keep track of temp files to clean up
-if show_slope:
-    png_file, bounds = geotiff_to_temp_png(slope_tif)
-    temp_files.append(png_file)
-    ImageOverlay(
-        name="Slope Map",
-        image=png_file,
-        bounds=[[bounds.bottom, bounds.left], [bounds.top, bounds.right]],
-        opacity=0.6,
-        interactive=True,
-        cross_origin=False,
-        zindex=1
-    ).add_to(m)
-
-if show_lulc:
-    png_file, bounds = geotiff_to_temp_png(lulc_tif)
-    temp_files.append(png_file)
-    ImageOverlay(
-        name=f"LULC {selected_date}",
-        image=png_file,
-        bounds=[[bounds.bottom, bounds.left], [bounds.top, bounds.right]],
-        opacity=0.6,
-        interactive=True,
-        cross_origin=False,
-        zindex=2
-    ).add_to(m)
-
-if show_river:
-    folium.GeoJson(
-        river_geojson,
-        name="River Network",
-        style_function=lambda feature: {
-            "color": "blue",
-            "weight": 2,
-            "opacity": 0.8
-        }
-    ).add_to(m)
+def build_lulc_map(lulc_tif, selected_date, show_slope, show_lulc, show_river, interactive):
+    # Built fresh every run: st_folium rewrites element ids while rendering, so a
+    # shared Map re-renders into a broken script. The costly parts (overlay PNGs,
+    # river GeoJSON) are cached on their own and only assembled here.
+    lulc_map = folium.Map(location=[-7.1, 110.45], zoom_start=12, tiles='Cartodb Positron', scrollWheelZoom=interactive,
+        dragging=interactive)
+
+    # One pane per layer keeps basemap < slope < LULC < river whether LULC is an
+    # image overlay (overlayPane) or XYZ tiles (tilePane); zIndex alone only
+    # orders layers within a single pane
+    for pane, z in (("slope", 410), ("lulc", 420), ("river", 430)):
+        folium.map.CustomPane(pane, z_index=z).add_to(lulc_map)
+
+    if show_slope:
+        overlay_src, bounds = geotiff_to_temp_png(slope_tif)
+        StaticImageOverlay(
+            name="Slope Map",
+            image=overlay_src,
+            bounds=[[bounds.bottom, bounds.left], [bounds.top, bounds.right]],
+            opacity=0.6,
+            interactive=True,
+            cross_origin=False,
+            pane="slope"
+        ).add_to(lulc_map)
+
+    if show_lulc:
+        tile_url = lulc_tile_url(lulc_tif)
+        if tile_url:
+            # Pre-built XYZ pyramid (scripts/build_tiles.py): browser only fetches visible tiles
+            folium.TileLayer(
+                tiles=tile_url,
+                attr="LULC",
+                name=f"LULC {selected_date}",
+                overlay=True,
+                opacity=0.6,
+                max_native_zoom=16,
+                pane="lulc"
+            ).add_to(lulc_map)
+        else:
+            overlay_src, bounds = geotiff_to_temp_png(lulc_tif)
+            StaticImageOverlay(
+                name=f"LULC {selected_date}",
+                image=overlay_src,
+                bounds=[[bounds.bottom, bounds.left], [bounds.top, bounds.right]],
+                opacity=0.6,
+                interactive=True,
+                cross_origin=False,
+                pane="lulc"
+            ).add_to(lulc_map)
+
+    if show_river:
+        river_tile_url = vector_tile_url("babon_channel")
+        if river_tile_url:
+            # Vector tiles: Leaflet only fetches and draws the channel segments in view
+            VectorGridProtobuf(
+                river_tile_url,
+                "River Network",
+                {
+                    "vectorTileLayerStyles": {
+                        "babon_channel": {
+                            "color": "blue",
+                            "weight": 2,
+                            "opacity": 0.8,
+                            "fill": True,
+                            "fillColor": "blue",
+                            "fillOpacity": 0.2
+                        }
+                    },
+                    "maxNativeZoom": 16,
+                    # VectorGrid is a GridLayer and would otherwise sit in tilePane, under LULC
+                    "pane": "river"
+                }
+            ).add_to(lulc_map)
+        else:
+            folium.GeoJson(
+                river_geojson,
+                name="River Network",
+                style_function=lambda feature: {
+                    "color": "blue",
+                    "weight": 2,
+                    "opacity": 0.8
+                },
+                pane="river"
+            ).add_to(lulc_map)
 
-# -----------------------------
-# Display Folium Map
-# -----------------------------
-st_folium(m,width=None, height=600)
+    return lulc_map
+
+m = build_lulc_map(lulc_tif, selected_date, show_slope, show_lulc, show_river, enable_map_interaction)
 
 # -----------------------------
-# Optional: Clean up temp PNGs (comment out if debugging)
+# Display Folium Map
 # -----------------------------
-#for f in temp_files:
-#    os.remove(f)
+st_folium(m, width=None, height=600, returned_objects=[])
 
 # -----------------------------
 # Description Tables (Slope & LULC)
@@ -738,65 +1171,34 @@ show_q = st.checkbox("Show Q Map", value=True)
 m_rpi = folium.Map(location=[-7.1, 110.45], zoom_start=12, tiles='Cartodb Positron',scrollWheelZoom=enable_map_interaction,
     dragging=enable_map_interaction)
 
-# -----------------------------
-# Cached raster → PNG converter
-# -----------------------------
-@st.cache_data(show_spinner=False)
-def geotiff_to_temp_png(tif_path):
-    with rasterio.open(tif_path) as src:
-        bounds = src.bounds
-        if src.count >= 4:
-            arr = src.read([1,2,3,4])
-            arr = np.transpose(arr, (1,2,0))
-            img = Image.fromarray(arr.astype(np.uint8), mode="RGBA")
-        elif src.count == 3:
-            arr = src.read([1,2,3])
-            arr = np.transpose(arr, (1,2,0))
-            img = Image.fromarray(arr.astype(np.uint8)).convert("RGBA")
-        else:
-            arr = src.read(1)
-            arr = np.where(arr == src.nodata, 0, arr)
-            arr = ((arr - arr.min()) / (arr.max()-arr.min()) * 255).astype(np.uint8)
-            img = Image.fromarray(arr).convert("RGBA")
-            datas = img.getdata()
-            new_data = [(0,0,0,0) if item[0]==0 else item for item in datas]
-            img.putdata(new_data)
-        tmp_file = tempfile.NamedTemporaryFile(suffix=".png", delete=False)
-        img.save(tmp_file.name)
-        return tmp_file.name, bounds
-
 # -----------------------------
 # Add selected layers
 # -----------------------------
-temp_files = []
 if show_rpi:
-    png_file, bounds = geotiff_to_temp_png(raster_files["RPI"])
-    temp_files.append(png_file)
-    ImageOverlay(
+    overlay_src, bounds = geotiff_to_temp_png(raster_files["RPI"])
+    StaticImageOverlay(
         name="RPI (Rendered)",
-        image=png_file,
+        image=overlay_src,
         bounds=[[bounds.bottom, bounds.left], [bounds.top, bounds.right]],
         opacity=1.0,
         interactive=True
     ).add_to(m_rpi)
 
 if show_rainfall:
-    png_file, bounds = geotiff_to_temp_png(raster_files["Rainfall"])
-    temp_files.append(png_file)
-    ImageOverlay(
+    overlay_src, bounds = geotiff_to_temp_png(raster_files["Rainfall"])
+    StaticImageOverlay(
         name="Rainfall (Interpolated)",
-        image=png_file,
+        image=overlay_src,
         bounds=[[bounds.bottom, bounds.left], [bounds.top, bounds.right]],
         opacity=0.95,
         interactive=True
     ).add_to(m_rpi)
 
 if show_q:
-    png_file, bounds = geotiff_to_temp_png(raster_files["Q"])
-    temp_files.append(png_file)
-    ImageOverlay(
+    overlay_src, bounds = geotiff_to_temp_png(raster_files["Q"])
+    StaticImageOverlay(
         name="Q (Runoff)",
-        image=png_file,
+        image=overlay_src,
         bounds=[[bounds.bottom, bounds.left], [bounds.top, bounds.right]],
         opacity=0.95,
         interactive=True
@@ -805,7 +1207,29 @@ if show_q:
 # -----------------------------
 # Display Folium map
 # -----------------------------
-st_folium(m_rpi, width=None, height=600)
+st_folium(m_rpi, width=None, height=600, returned_objects=[])
+
+@st.cache_data
+def rpi_table():
+    # Static reference table, built once; swatches are tiny inline SVGs for an ImageColumn
+    df_rpi = pd.DataFrame({
+        "Class": ["1", "2", "3", "4", "5"],
+        "RPI Range": ["0.12–0.25", "0.25–0.38", "0.38–0.51", "0.51–0.64", "0.64–0.72"],
+        "Color": ["aliceblue", "lightskyblue", "deepskyblue", "royalblue", "navy"],
+        "Runoff Potential": ["Very Low", "Low", "Moderate", "High", "Very High"],
+        "Description": [
+            "Dominated by dense vegetation or permeable soils. High infiltration capacity; low imperviousness and minimal surface runoff.",
+            "Mostly pervious cover such as cropland and grassland with gentle slopes. Moderate infiltration; limited direct runoff.",
+            "Mixed surfaces or transitional land uses. Balanced infiltration and surface runoff; moderately impervious areas.",
+            "Predominantly compacted or semi-impervious surfaces (urban fringe, infrastructure). Reduced infiltration; higher direct runoff response.",
+            "Highly impervious or steep terrain (urban core, paved surfaces). Very low infiltration and rapid surface runoff generation.",
+        ],
+    })
+    df_rpi["Color"] = df_rpi["Color"].map(lambda c: "data:image/svg+xml;base64," + base64.b64encode(
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="25" height="25"><rect x="0.5" y="0.5" width="24" height="24" '
+        f'rx="4" fill="{c}" stroke="#ccc"/></svg>'.encode()
+    ).decode())
+    return df_rpi
 
 # -----------------------------
 # Dropdown to select legend type
@@ -857,213 +1281,110 @@ elif legend_option == "Discharge (Q)":
 # -----------------------------
 elif legend_option == "Runoff Potential Index (RPI)":
     st.subheader("🧭 Runoff Potential Index (RPI) Classification")
-    df_rpi = pd.DataFrame({
-        "Class": ["1", "2", "3", "4", "5"],
-        "RPI Range": ["0.12–0.25", "0.25–0.38", "0.38–0.51", "0.51–0.64", "0.64–0.72"],
-        "Color": ["aliceblue", "lightskyblue", "deepskyblue", "royalblue", "navy"],
-        "Runoff Potential": ["Very Low", "Low", "Moderate", "High", "Very High"],
-        "Description": [
-            "Dominated by dense vegetation or permeable soils. High infiltration capacity; low imperviousness and minimal surface runoff.",
-            "Mostly pervious cover such as cropland and grassland with gentle slopes. Moderate infiltration; limited direct runoff.",
-            "Mixed surfaces or transitional land uses. Balanced infiltration and surface runoff; moderately impervious areas.",
-            "Predominantly compacted or semi-impervious surfaces (urban fringe, infrastructure). Reduced infiltration; higher direct runoff response.",
-            "Highly impervious or steep terrain (urban core, paved surfaces). Very low infiltration and rapid surface runoff generation.",
-        ],
-    })
-    df_rpi["Color"] = df_rpi["Color"].apply(lambda c: f'<div style="width:25px; height:25px; background-color:{c}; border-radius:4px; border:1px solid #ccc;"></div>')
-    st.write(df_rpi.to_html(escape=False, index=False), unsafe_allow_html=True)
+    st.dataframe(
+        rpi_table(),
+        hide_index=True,
+        column_config={
+            "Color": st.column_config.ImageColumn("Color", width="small"),
+            "Description": st.column_config.TextColumn("Description", width="large"),
+        },
+    )
     st.caption("Source: Dhakal, N. (2019). *Development of Guidance for Runoff Coefficient Selection and Modified Rational Unit Hydrograph Method for Hydrologic Design.*")
-st.markdown(
-    """
-    <div id="rpi_q" style="margin:5vw auto; max-width:90%; line-height:1.6; text-align:justify; color:white;">
-        <h1 style="font-size:clamp(22px, 2.2vw, 32px); text-align:left; margin-bottom:20px;">
-            Runoff Potential Index (RPI), Rainfall, and Discharge (Q) Analysis
-        </h1>
-        <div style="font-size:clamp(14px, 1.5vw, 18px); line-height:1.8;">
-            <strong>Runoff Potential Index (RPI)</strong><br>
-            The RPI was developed to estimate spatial variations in runoff potential across the upper Kali Babon Watershed. 
-            The analysis integrates three key factors: land cover (LULC 2025), slope, and flow accumulation. 
-            The runoff coefficient (C) for each LULC class was derived based on <strong>Dhakal (2019)</strong>, slope values were normalized from the 8 × 8 m DEMNAS data, and flow accumulation was obtained from the r.watershed plugin. 
-            A weighted overlay was applied with <strong>w_LULC = 0.5</strong>, <strong>w_slope = 0.3</strong>, and <strong>w_accumulation = 0.2</strong> to generate the RPI map.
-            <br><br>
-            The resulting RPI distribution indicates that the <strong>West-1 Segment</strong> ranges from moderate to very high, the <strong>East-1 Segment</strong> is predominantly low to moderate, and the <strong>East Segment</strong> exhibits very low to low runoff potential.
-            <br><br>
-            <strong>Rainfall and Discharge (Q)</strong><br>
-            Rainfall data from all climate stations were collected for the extreme flood event on <strong>6 January 2023</strong>, when daily precipitation ranged from 21.52 mm to 64.20 mm. 
-            These data were spatially interpolated to create a continuous rainfall surface, revealing that the highest rainfall occurred in the <strong>East Segment</strong>, while lower intensities were observed toward the southwest.
-            <br><br>
-            By combining the interpolated rainfall map with the RPI, a <strong>discharge (Q) map</strong> was generated to estimate spatial runoff magnitudes and identify flood-prone zones. 
-            Zonal statistics for half-basin segments quantified flow accumulation and peak discharge, demonstrating how the interaction of land cover, slope, and upstream contributing areas governs downstream hydrological response.
-            <br><br>
-            The analysis identifies the <strong>West-1 Segment</strong> and the <strong>East Segment</strong> as the dominant contributors to downstream flooding. 
-            The West-1 Segment is mostly urbanized on a flat, high-elevation plateau, with only small areas of steep slopes covered by forest and grassland that locally enhance runoff. 
-            The East Segment, in contrast, contributes significant flow due to the extreme rainfall (>60 mm/day) it received during the event. 
-            This combination of high-intensity rainfall in the East segment and localized runoff from steeper portions of West-1 explains the major flooding observed at Perumahan Dinar Indah. 
-            The East-1 Segment shows lower discharge due to moderate slopes and land cover that promotes infiltration.
-            <br><br>
-            <em style="color:#c2e5ff;">
-            Users can interact with the map above by selecting or deselecting the <strong>RPI</strong>, <strong>Rainfall</strong>, and <strong>Discharge (Q)</strong> layers using the checklist. 
-            Dropdown menus allow switching between descriptive classifications and hydrological interpretations for each layer, providing a dynamic and interactive way to explore watershed behavior and flood vulnerability.
-            </em>
-        </div>
-    </div>
-    """,
-    unsafe_allow_html=True
-)
+st.markdown(RPI_HTML, unsafe_allow_html=True)
 
 
 
-# ----------------------------
-# Opacity Slider
-# ----------------------------
-st.subheader("Adjust Half-Basin Opacity")
-basin_opacity = st.slider("Half-Basin Opacity", min_value=0.0, max_value=1.0, value=0.7, step=0.05)
-
 # ----------------------------
 # Load Styled GeoJSON
 # ----------------------------
-geojson_path = "data/Runoff_statistic_styled.geojson"
-try:
-    with open(geojson_path) as f:
-        basins_geojson = json.load(f)
-except FileNotFoundError:
-    st.error(f"❌ Styled GeoJSON not found: {geojson_path}")
-    st.stop()
+def content_key(path):
+    # Content hash from the .sha1 sidecar written by scripts/simplify_basins.py, so a
+    # redeploy or copy with a new mtime still hits the cache; falls back to the mtime
+    try:
+        with open(path + ".sha1") as f:
+            return f.read().split()[0]
+    except FileNotFoundError:
+        return _source_mtimes([path])[0]
 
-# ----------------------------
-# Apply Dynamic Opacity
-# ----------------------------
-for feature in basins_geojson['features']:
-    if 'style' in feature['properties']:
-        feature['properties']['style']['fillOpacity'] = basin_opacity
+@st.cache_data(show_spinner=False)
+def load_basins(path, key):
+    # Parsed once per file version (orjson, straight from bytes); the key is only the cache key
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+# Display copy from scripts/simplify_basins.py (pixel staircases removed, ~10x smaller)
+geojson_path = "data/Runoff_statistic_styled.min.geojson"
 
 # ----------------------------
 # Create Folium Map
 # ----------------------------
-st.subheader("Half-Basin Map (Mean Q)")
-
-m = folium.Map(location=[-7.1, 110.45], zoom_start=12, tiles='OpenStreetMap',scrollWheelZoom=enable_map_interaction,
-    dragging=enable_map_interaction)
-
-# Define tooltip with all statistics
-tooltip = folium.GeoJsonTooltip(
-    fields=['mean_Q', 'med_Q', 'max_Q', 'min_Q', 'sum_Q', 'std_Q'],
-    aliases=['Mean Q', 'Median Q', 'Max Q', 'Min Q', 'Sum Q', 'Std Dev Q'],
-    localize=True,
-    sticky=False,
-    labels=True,
-    style="""
-        background-color: white;
-        border: 1px solid black;
-        border-radius: 3px;
-        padding: 5px;
-    """
-)
-
-# Add GeoJSON layer with style and full tooltip
-folium.GeoJson(
-    basins_geojson,
-    name="Half-Basin Mean Q",
-    style_function=lambda feature: feature['properties']['style'],
-    tooltip=tooltip  # ← use the full tooltip object here
-).add_to(m)
-
-# Render map
-st_folium(m,width=None, height=600)
-
-st.markdown(
-    """
-    <div id="q_analysis" style="margin:5vw auto; max-width:90%; line-height:1.8; color:white;">
-        <h1 style="
-            font-size:clamp(22px, 2.2vw, 32px); 
-            text-align:center; 
-            margin-bottom:15px;
-        ">
-            Runoff (Q) Analysis by Half-Basin
-        </h1>
-        <div style="
-            font-size:clamp(14px, 1.5vw, 18px); 
-            line-height:1.8; 
-            text-align:justify;
-        ">
-            The runoff (Q) analysis was performed by aggregating flow estimates for each <strong>half-basin segment</strong>, providing a detailed view of sub-catchment contributions to downstream flooding. The <strong>mean Q values</strong> per half-basin highlight spatial differences in runoff response:
-            <br><br>
-            <strong>West-1 Segment:</strong> Mean Q ranges from 12 to 17. Mostly urbanized on a flat plateau, with small areas of steeper slopes covered by forest and grassland that locally enhance runoff.
-            <br>
-            <strong>East Segment:</strong> Mean Q ranges from 11 to 15. Receives the highest rainfall (>60 mm/day) but runoff is moderated by gentle slopes and mixed agricultural/grassland cover.
-            <br>
-            <strong>East-1 Segment:</strong> Mean Q is approximately 10–11, reflecting lower runoff due to moderate slopes and forested patches promoting infiltration.
-            <br><br>
-            These results illustrate that <strong>flood risk is influenced by rainfall intensity, physiography, and land cover</strong>. 
-            <br><br>
-            On the interactive map:
-            <ul>
-                <li>Hover over each half-basin to view detailed statistics and notes for that segment.</li>
-                <li>Use the opacity slider to adjust the half-basin transparency, making it easier to observe underlying geographic features and segment names.</li>
-            </ul>
-            This approach allows users to dynamically explore which areas dominate runoff production and how different segments interact to influence downstream flooding, supporting data-informed management decisions.
-        </div>
-    </div>
-    """,
-    unsafe_allow_html=True
-)
-
-
-st.markdown(
-    """
-    <div id="methodology" style="margin-top:50px; font-size:40px; font-weight:bold; text-align:left; color:white;">
-        Methodology
-    </div>
-
-    <div style="font-size:16px; color:white; text-align:justify; margin-top:15px;">
-        This study integrates <strong>data collection, processing, hydrological analysis, and mapping</strong>
-        to assess flood hazards and runoff dynamics within the Kali Babon Watershed. Flood incident data 
-        (2020–2023) were obtained from <em>BPBD Jawa Tengah</em>, while rainfall data (2021–2023) were 
-        sourced from PUSDATARU Jawa Tengah and BBWS Pemali Juana, then extracted from PDF format using 
-        a dedicated Python script.
-    </div>
+@st.cache_resource(max_entries=32)
+def basin_map_html(opacity, interactive, basins_key):
+    # Only the opacity (and the interaction toggle) varies, so each map is built and rendered
+    # to HTML once per value; re-rendering a cached folium map every rerun is not free
+    basin_map = folium.Map(location=[-7.1, 110.45], zoom_start=12, tiles='OpenStreetMap', scrollWheelZoom=interactive,
+        dragging=interactive)
+
+    # Same yellow-orange-red ramp the styled file was coloured with; basins without Q stay black
+    basins_geojson = load_basins(geojson_path, basins_key)
+    mean_q = [f['properties']['mean_Q'] for f in basins_geojson['features']]
+    mean_q = [q for q in mean_q if q is not None]
+    q_min, q_max = min(mean_q), max(mean_q)
+    cmap = linear.YlOrRd_09.scale(q_min, q_max)
+
+    basin_tile_url = vector_tile_url("half_basins")
+    if basin_tile_url:
+        # Vector tiles (scripts/build_vector_tiles.py): no GeoJSON in the page, only visible tiles are
+        # fetched. Tiles carry the same properties as the GeoJSON, so the style is the same mean_Q
+        # ramp, sent as a 256-step lookup table.
+        ramp = [cmap.rgb_hex_str(q_min + (q_max - q_min) * i / 255) for i in range(256)]
+        basin_grid = VectorGridProtobuf(
+            basin_tile_url,
+            "Half-Basin Mean Q",
+            '{"interactive": true, "vectorTileLayerStyles": {"half_basins": (function () {'
+            f' var ramp = {orjson.dumps(ramp).decode()};'
+            ' return function (p) { var q = p.mean_Q, color = "#000000";'
+            f' if (q != null) {{ color = ramp[Math.max(0, Math.min(255, Math.round((q - {q_min}) / {q_max - q_min} * 255)))]; }}'
+            ' return {"color": color, "weight": 2, "fill": true, "fillColor": color,'
+            f' "fillOpacity": {opacity}}}; }}; }})()}}}}'
+        ).add_to(basin_map)
+        VectorGridTooltip(BASIN_TOOLTIP_FIELDS, BASIN_TOOLTIP_ALIASES).add_to(basin_grid)
+    else:
+        def basin_style(feature, o=opacity):
+            q = feature['properties']['mean_Q']
+            color = cmap.rgb_hex_str(q) if q is not None else '#000000'
+            return {'color': color, 'fillColor': color, 'weight': 2, 'fillOpacity': o}
+
+        # Add GeoJSON layer with style and full tooltip
+        folium.GeoJson(
+            basins_geojson,
+            name="Half-Basin Mean Q",
+            style_function=basin_style,
+            tooltip=folium.GeoJsonTooltip(**BASIN_TOOLTIP)
+        ).add_to(basin_map)
+    return basin_map.get_root().render()
 
-    <div style="font-size:16px; color:white; text-align:justify; margin-top:15px;">
-        <strong>DEM data</strong> from <em>DEMNAS</em> with 8×8 m resolution were used to derive 
-        <strong>elevation, slope, and watershed boundaries</strong>. The DEM was first hydrologically 
-        corrected using <strong>r.fill</strong> to remove sinks, then <strong>r.watershed</strong> 
-        was applied to calculate flow accumulation.
-    </div>
+# ----------------------------
+# Half-Basin Map (built only when requested)
+# ----------------------------
+# Gated in session state rather than put in st.tabs: tab bodies still execute, and the
+# sidebar anchors need every text section on the page
+if st.toggle("🗺️ Show half-basin map", key="show_basin_map"):
+    st.subheader("Adjust Half-Basin Opacity")
+    # In a form so dragging the slider does not rerun the script on every step; applied on submit
+    with st.form("opacity_form", border=False):
+        basin_opacity = st.slider("Half-Basin Opacity", min_value=0.0, max_value=1.0, value=0.7, step=0.05)
+        st.form_submit_button("Apply")
 
-    <div style="font-size:16px; color:white; text-align:justify; margin-top:15px;">
-        <strong>LULC data</strong> were obtained from <em>Sentinel-2 Copernicus imagery</em> and 
-        classified using the <strong>Semi-Automatic Classification Plugin (SCP) in QGIS</strong> 
-        with a Random Forest classifier of 400 trees and balanced class weights to ensure accurate 
-        land cover mapping.
-    </div>
+    st.subheader("Half-Basin Map (Mean Q)")
+    basins_key = content_key(geojson_path)
 
-    <div style="font-size:16px; color:white; text-align:justify; margin-top:15px;">
-        The <strong>Runoff Potential Index (RPI)</strong> was computed by integrating LULC-derived 
-        runoff coefficients (C, according to Dhakal, 2019), normalized slope, and flow accumulation, 
-        using weights of 0.5 (LULC), 0.3 (slope), and 0.2 (accumulation). RPI values were standardized 
-        and classified into minimum–maximum ranges to evaluate runoff potential for each segment.
-    </div>
+    # Render map as static HTML: tooltips work client-side and nothing is synced back to Python
+    components.html(basin_map_html(basin_opacity, enable_map_interaction, basins_key), height=600)
 
-    <div style="font-size:16px; color:white; text-align:justify; margin-top:15px;">
-        <strong>Runoff (Q)</strong> was estimated using the RPI and interpolated rainfall data, 
-        followed by a half-basin analysis to summarize mean Q per sub-catchment, providing insight 
-        into the contribution of upstream segments to downstream flood risk.
-    </div>
+st.markdown(Q_ANALYSIS_HTML, unsafe_allow_html=True)
 
-    <div style="font-size:16px; color:white; text-align:justify; margin-top:15px;">
-        All maps—including RPI, rainfall intensity, slope, and runoff—were standardized according 
-        to hydrological theory and conventional classification ranges (e.g., very low to very high), 
-        enabling consistent interpretation of flood hazards and runoff dynamics.
-    </div>
 
-    <div style="font-size:16px; color:white; text-align:justify; margin-top:15px;">
-        This integrated workflow provides a comprehensive framework combining <strong>observational 
-        data, satellite imagery classification, hydrologically corrected DEM analysis, spatial processing, 
-        hydrological modeling, and standardized mapping</strong> to support robust understanding of 
-        flood behavior and runoff characteristics across the Kali Babon Watershed.
-    </div>
-    """,
-    unsafe_allow_html=True
-)
+st.markdown(METHODOLOGY_HTML, unsafe_allow_html=True)
 
 
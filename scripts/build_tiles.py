@@ -0,0 +1,52 @@
+# ==========================================================
+# Pre-tile the LULC rasters into XYZ PNG pyramids
+# ==========================================================
+# Run once from the repository root whenever a LULC raster changes:
+#
+#     python scripts/build_tiles.py
+#
+# Output goes to static/tiles/<raster name>/{z}/{x}/{y}.png, which Streamlit
+# serves at /app/static/tiles/... (see .streamlit/config.toml). Requires the
+# GDAL command-line tools (gdal2tiles.py) on PATH.
+
+import os
+import shutil
+import subprocess
+import sys
+
+LULC_FILES = [
+    "data/lulc_2020_styled.tif",
+    "data/lulc_2021_styled.tif",
+    "data/lulc_2022_styled.tif",
+    "data/lulc_2023_styled.tif",
+    "data/lulc_2025_styled.tif",
+]
+TILE_DIR = "static/tiles"
+ZOOM_LEVELS = "10-16"
+
+
+def build_tiles(tif_path):
+    name = os.path.splitext(os.path.basename(tif_path))[0]
+    out_dir = os.path.join(TILE_DIR, name)
+    if os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+
+    subprocess.run(
+        [
+            "gdal2tiles.py",
+            "--xyz",
+            "--profile=mercator",
+            "--resampling=near",
+            "--webviewer=none",
+            "-z", ZOOM_LEVELS,
+            tif_path,
+            out_dir,
+        ],
+        check=True,
+    )
+    print(f"✅ {tif_path} → {out_dir}")
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:] or LULC_FILES:
+        build_tiles(path)
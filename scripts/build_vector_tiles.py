@@ -0,0 +1,59 @@
+# ==========================================================
+# Pre-tile vector layers into XYZ Mapbox Vector Tiles
+# ==========================================================
+# Run once from the repository root whenever a source GeoJSON changes:
+#
+#     python scripts/build_vector_tiles.py
+#
+# Output goes to static/tiles/<layer>/{z}/{x}/{y}.pbf (uncompressed, since
+# Streamlit's static server does not send Content-Encoding), served at
+# /app/static/tiles/... . Requires tippecanoe on PATH.
+
+import os
+import shutil
+import subprocess
+import sys
+
+LAYERS = {
+    "babon_channel": "data/babon_channel.geojson",
+    "half_basins": "data/Runoff_statistic_styled.min.geojson",
+}
+# Feature properties to keep per layer (tippecanoe --include); unlisted layers keep all.
+# The half-basins are styled from mean_Q in the app and only need the six tooltip statistics.
+ATTRIBUTES = {
+    "half_basins": ["mean_Q", "med_Q", "max_Q", "min_Q", "sum_Q", "std_Q"],
+}
+TILE_DIR = "static/tiles"
+MIN_ZOOM, MAX_ZOOM = 10, 16
+
+
+def build_vector_tiles(layer, src):
+    out_dir = os.path.join(TILE_DIR, layer)
+    if os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+
+    include = []
+    for attr in ATTRIBUTES.get(layer, []):
+        include += ["--include", attr]
+
+    subprocess.run(
+        [
+            "tippecanoe",
+            "--output-to-directory", out_dir,
+            "--layer", layer,
+            "--minimum-zoom", str(MIN_ZOOM),
+            "--maximum-zoom", str(MAX_ZOOM),
+            "--no-tile-compression",
+            "--drop-densest-as-needed",
+            "--force",
+            *include,
+            src,
+        ],
+        check=True,
+    )
+    print(f"✅ {src} → {out_dir}")
+
+
+if __name__ == "__main__":
+    for layer in sys.argv[1:] or list(LAYERS):
+        build_vector_tiles(layer, LAYERS[layer])
@@ -0,0 +1,54 @@
+# ==========================================================
+# Simplify the half-basin runoff polygons for display
+# ==========================================================
+# The styled half-basin layer is polygonized from an 8 m raster, so every
+# boundary is a pixel staircase. Douglas–Peucker at ~1.5 pixels removes the
+# stairs while keeping the segment shapes. Run from the repository root:
+#
+#     python scripts/simplify_basins.py
+#
+# Only the runoff statistics shown in the tooltip are kept, rounded to 2
+# decimals: the dashboard colours each basin from mean_Q, so the baked
+# per-feature colour/style dicts are dropped. The original file stays the
+# source of truth for the zonal statistics; the dashboard only reads the
+# simplified copy, keyed on the <dst>.sha1 content hash written alongside it.
+
+import argparse
+import hashlib
+import json
+import os
+
+from simplify_geojson import simplify_geometry
+
+SRC = "data/Runoff_statistic_styled.geojson"
+DST = "data/Runoff_statistic_styled.min.geojson"
+PROPERTIES = ["mean_Q", "med_Q", "max_Q", "min_Q", "sum_Q", "std_Q"]
+
+
+def simplify_basins(src, dst, tolerance=1e-4, precision=5, digits=2):
+    with open(src) as f:
+        data = json.load(f)
+    for feature in data["features"]:
+        feature["geometry"] = simplify_geometry(feature["geometry"], tolerance, precision)
+        props = feature["properties"]
+        feature["properties"] = {
+            k: round(props[k], digits) if props.get(k) is not None else None for k in PROPERTIES
+        }
+    payload = json.dumps(data, separators=(",", ":")).encode()
+    with open(dst, "wb") as f:
+        f.write(payload)
+    # sha1sum-style sidecar: the app's cache key, stable across copies and deploys
+    with open(dst + ".sha1", "w") as f:
+        f.write(f"{hashlib.sha1(payload).hexdigest()}  {os.path.basename(dst)}\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simplify the half-basin GeoJSON for display")
+    parser.add_argument("--src", default=SRC)
+    parser.add_argument("--dst", default=DST)
+    parser.add_argument("--tolerance", type=float, default=1e-4)
+    parser.add_argument("--precision", type=int, default=5)
+    parser.add_argument("--digits", type=int, default=2)
+    args = parser.parse_args()
+    simplify_basins(args.src, args.dst, args.tolerance, args.precision, args.digits)
+    print(f"✅ {args.src} → {args.dst}")
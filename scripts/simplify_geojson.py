@@ -0,0 +1,92 @@
+# ==========================================================
+# Simplify a GeoJSON layer for display
+# ==========================================================
+# Douglas–Peucker simplification of every line/ring plus coordinate rounding,
+# written as compact JSON. Run from the repository root, e.g.:
+#
+#     python scripts/simplify_geojson.py data/babon_channel.geojson data/babon_channel.min.geojson
+#
+# Tolerance is in coordinate units (degrees for these CRS84 layers); the
+# default 1e-5 (~1 m) drops collinear/jitter vertices with no visible change.
+
+import argparse
+import json
+
+
+def _perpendicular_dist(p, a, b):
+    (x, y), (x1, y1), (x2, y2) = p, a, b
+    dx, dy = x2 - x1, y2 - y1
+    if dx == 0 and dy == 0:
+        return ((x - x1) ** 2 + (y - y1) ** 2) ** 0.5
+    t = max(0.0, min(1.0, ((x - x1) * dx + (y - y1) * dy) / (dx * dx + dy * dy)))
+    return ((x - x1 - t * dx) ** 2 + (y - y1 - t * dy) ** 2) ** 0.5
+
+
+def douglas_peucker(coords, tolerance):
+    if len(coords) < 3:
+        return coords
+    keep = [False] * len(coords)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(coords) - 1)]
+    while stack:
+        start, end = stack.pop()
+        max_dist, index = 0.0, None
+        for i in range(start + 1, end):
+            d = _perpendicular_dist(coords[i], coords[start], coords[end])
+            if d > max_dist:
+                max_dist, index = d, i
+        if index is not None and max_dist > tolerance:
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+    return [c for c, k in zip(coords, keep) if k]
+
+
+def _round(coords, precision):
+    out = []
+    for c in coords:
+        r = [round(c[0], precision), round(c[1], precision)]
+        if not out or out[-1] != r:
+            out.append(r)
+    return out
+
+
+def simplify_line(coords, tolerance, precision, closed=False):
+    simplified = _round(douglas_peucker(coords, tolerance), precision)
+    # A ring needs 4 positions; never let simplification collapse it
+    if closed and len(simplified) < 4:
+        return _round(coords, precision)
+    return simplified
+
+
+def simplify_geometry(geom, tolerance, precision):
+    kind, coords = geom["type"], geom["coordinates"]
+    if kind == "LineString":
+        coords = simplify_line(coords, tolerance, precision)
+    elif kind == "MultiLineString":
+        coords = [simplify_line(c, tolerance, precision) for c in coords]
+    elif kind == "Polygon":
+        coords = [simplify_line(r, tolerance, precision, closed=True) for r in coords]
+    elif kind == "MultiPolygon":
+        coords = [[simplify_line(r, tolerance, precision, closed=True) for r in p] for p in coords]
+    return {"type": kind, "coordinates": coords}
+
+
+def simplify_file(src, dst, tolerance=1e-5, precision=5):
+    with open(src) as f:
+        data = json.load(f)
+    for feature in data["features"]:
+        feature["geometry"] = simplify_geometry(feature["geometry"], tolerance, precision)
+    with open(dst, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simplify a GeoJSON layer for display")
+    parser.add_argument("src")
+    parser.add_argument("dst")
+    parser.add_argument("--tolerance", type=float, default=1e-5)
+    parser.add_argument("--precision", type=int, default=5)
+    args = parser.parse_args()
+    simplify_file(args.src, args.dst, args.tolerance, args.precision)
+    print(f"✅ {args.src} → {args.dst}")